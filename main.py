@@ -64,6 +64,12 @@ Examples:
         help="Skip the file sanitization step.",
     )
 
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Reprocess every PDF even if its JSON output already exists.",
+    )
+
     parser.add_argument(
         "--no-cleanup",
         action="store_true",
@@ -92,6 +98,7 @@ Examples:
             skip_sanitize=args.skip_sanitize,
             cleanup=not args.no_cleanup,
             compare_mode=args.compare,
+            resume=not args.no_resume,
         )
     except KeyboardInterrupt:
         print("\n[main] Pipeline interrupted by user.")
@@ -1,8 +1,31 @@
 """Abstract base class for AI backends."""
 
 from abc import ABC, abstractmethod
+import contextlib
 import json
-from .. import utils
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .. import config, utils
+from . import cache
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces out call starts to max_rate per period."""
+
+    def __init__(self, max_rate, period=1.0):
+        self.interval = period / max_rate
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def acquire(self):
+        """Block until the next call slot is available."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+        if wait > 0:
+            time.sleep(wait)
 
 
 class AIBackend(ABC):
@@ -22,6 +45,18 @@ class AIBackend(ABC):
         self.model_name = model_name
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        # Backend-wide throttle: caps in-flight requests and request starts
+        # per second so concurrent fanout stays under provider limits
+        # instead of oscillating between bursts and 429 backoff.
+        self._inflight = threading.BoundedSemaphore(config.AI_MAX_INFLIGHT)
+        self._rate_limiter = RateLimiter(config.AI_RPS)
+
+    @contextlib.contextmanager
+    def _throttle(self):
+        """Hold an in-flight slot and pace the request start."""
+        with self._inflight:
+            self._rate_limiter.acquire()
+            yield
 
     @abstractmethod
     def process_pdf(self, pdf_path, prompt_text):
@@ -37,6 +72,114 @@ class AIBackend(ABC):
         """
         pass
 
+    def process_pdfs_batch(self, pdf_paths, prompt_text):
+        """
+        Process several PDFs and return results keyed by path.
+
+        Backends override this with provider-native batching (Claude's
+        Message Batches API) or concurrent dispatch (Gemini via asyncio).
+        The default fans process_pdf out over a thread pool: the work is
+        network-bound (the GIL is released in the HTTP client), so
+        concurrency up to the in-flight cap gives near-linear speedup.
+
+        Args:
+            pdf_paths: List of PDF file paths
+            prompt_text: Prompt to send to AI
+
+        Returns:
+            Dict mapping each pdf_path to its card list (or None on error)
+        """
+        if not pdf_paths:
+            return {}
+
+        max_workers = min(len(pdf_paths), config.AI_MAX_INFLIGHT)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            card_lists = executor.map(
+                lambda path: self.process_pdf(path, prompt_text), pdf_paths
+            )
+            return dict(zip(pdf_paths, card_lists))
+
+    def stitch_chunk_results(self, chunk_paths, results):
+        """
+        Concatenate one PDF's per-chunk card lists back in chunk order.
+
+        The chunks themselves ride through the batch machinery alongside
+        every other path; this only reassembles their results, so callers
+        that already hold a batch result dict don't re-fetch anything.
+
+        Args:
+            chunk_paths: Ordered list of chunk file paths for one PDF
+            results: Dict mapping paths to card lists (or None on error)
+
+        Returns:
+            Combined list of card dictionaries, or None if no chunk succeeded
+        """
+        all_cards = []
+        for chunk_idx, chunk_path in enumerate(chunk_paths, start=1):
+            cards = results.get(chunk_path)
+            if cards:
+                print(f"[backend] Chunk {chunk_idx}/{len(chunk_paths)} returned {len(cards)} cards")
+                all_cards.extend(cards)
+            else:
+                print(f"[backend] Chunk {chunk_idx}/{len(chunk_paths)} failed or returned no cards")
+
+        return all_cards if all_cards else None
+
+    def process_pdf_cached(self, pdf_path, prompt_text):
+        """
+        Process a PDF, consulting the persistent response cache first.
+
+        Args:
+            pdf_path: Path to PDF file
+            prompt_text: Prompt to send to AI
+
+        Returns:
+            List of card dictionaries or None on error
+        """
+        key = cache.make_key(pdf_path, self.model_name, prompt_text)
+        cards = cache.get(key)
+        if cards is not None:
+            print(f"[cache] Using cached response for {pdf_path}")
+            return cards
+
+        cards = self.process_pdf(pdf_path, prompt_text)
+        if cards is not None:
+            cache.put(key, cards)
+        return cards
+
+    def process_pdfs_batch_cached(self, pdf_paths, prompt_text):
+        """
+        Batch variant of process_pdf_cached: only cache misses hit the API.
+
+        Args:
+            pdf_paths: List of PDF file paths
+            prompt_text: Prompt to send to AI
+
+        Returns:
+            Dict mapping each pdf_path to its card list (or None on error)
+        """
+        results = {}
+        misses = []
+        keys = {}
+        for pdf_path in pdf_paths:
+            key = cache.make_key(pdf_path, self.model_name, prompt_text)
+            keys[pdf_path] = key
+            cards = cache.get(key)
+            if cards is not None:
+                print(f"[cache] Using cached response for {pdf_path}")
+                results[pdf_path] = cards
+            else:
+                misses.append(pdf_path)
+
+        if misses:
+            fresh = self.process_pdfs_batch(misses, prompt_text)
+            for pdf_path, cards in fresh.items():
+                if cards is not None:
+                    cache.put(keys[pdf_path], cards)
+            results.update(fresh)
+
+        return results
+
     def validate_response(self, cards):
         """
         Validate and normalize card response.
@@ -81,17 +224,5 @@ class AIBackend(ABC):
         Returns:
             Tuple of (validated_cards, error_message)
         """
-        is_valid, error_msg, filtered_cards = utils.validate_required_fields(cards)
-        if not is_valid:
-            return None, error_msg
-
-        # Use filtered cards if available, otherwise use original
-        cards_to_normalize = filtered_cards if filtered_cards is not None else cards
-
-        # Normalize cloze deletions
-        cards = utils.normalize_cloze_payload(cards_to_normalize)
-
-        # Add tag
-        cards = self.add_file_tag(cards, tag)
-
-        return cards, ""
+        # Single fused pass: validate, normalize cloze, and tag per card.
+        return utils.fused_validate_normalize_tag(cards, tag)
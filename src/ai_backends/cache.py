@@ -0,0 +1,52 @@
+"""Persistent cache of AI card responses keyed by PDF content."""
+
+import hashlib
+import json
+import os
+from .. import config
+
+
+def make_key(pdf_path, model_name, prompt_text):
+    """
+    Build a cache key from PDF content, model, and prompt.
+
+    The key is content-addressed (sha256 of the PDF bytes), so renamed or
+    re-sanitized files still hit, while any edit to the PDF, the prompt,
+    or a model switch misses.
+    """
+    # Hash in 1 MiB blocks so peak memory stays constant regardless of
+    # PDF size (keys may be computed for many PDFs concurrently).
+    pdf_hash = hashlib.sha256()
+    with open(pdf_path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            pdf_hash.update(block)
+    prompt_hash = hashlib.sha256(prompt_text.encode("utf-8")).hexdigest()
+    return f"{pdf_hash.hexdigest()}-{model_name}-{prompt_hash}"
+
+
+def _cache_path(key):
+    """Path of the cache file for a key."""
+    return os.path.join(config.CACHE_DIR, f"{key}.json")
+
+
+def get(key):
+    """Return the cached card list for key, or None on miss."""
+    cache_path = _cache_path(key)
+    if not os.path.isfile(cache_path):
+        return None
+
+    try:
+        with open(cache_path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, json.JSONDecodeError) as exc:
+        print(f"[cache] Ignoring unreadable cache entry {key}: {exc}")
+        return None
+
+
+def put(key, cards):
+    """Store a card list under key."""
+    try:
+        with open(_cache_path(key), "w", encoding="utf-8") as handle:
+            json.dump(cards, handle, ensure_ascii=False)
+    except OSError as exc:
+        print(f"[cache] Could not write cache entry {key}: {exc}")
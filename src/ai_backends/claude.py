@@ -2,8 +2,14 @@
 
 import base64
 import json
+import mmap
 import time
 from anthropic import Anthropic
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from .. import utils
 from .base import AIBackend
 
@@ -29,6 +35,158 @@ class ClaudeBackend(AIBackend):
 
         return str(response)
 
+    def _encode_pdf(self, pdf_path):
+        """Base64-encode a PDF without materializing the raw bytes in heap.
+
+        Encoding straight from an mmap view skips the full-file read()
+        copy, so peak memory per request is one base64 string instead of
+        raw + encoded + decoded copies.
+        """
+        with open(pdf_path, "rb") as pdf_file:
+            with mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return base64.b64encode(mm).decode("ascii")
+
+    def _build_message_params(self, pdf_path, prompt_text):
+        """Build the messages.create params for a single PDF request.
+
+        The prompt block leads the message and carries a cache_control
+        breakpoint: the prompt is identical across all PDFs in a run, so
+        server-side prompt caching discounts its tokens on every request
+        after the first.
+        """
+        return {
+            "model": self.model_name,
+            "max_tokens": 64000,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": prompt_text,
+                            "cache_control": {"type": "ephemeral"},
+                        },
+                        {
+                            "type": "document",
+                            "source": {
+                                "type": "base64",
+                                "media_type": "application/pdf",
+                                "data": self._encode_pdf(pdf_path),
+                            },
+                        },
+                    ],
+                }
+            ],
+        }
+
+    def _parse_cards(self, raw_text):
+        """Parse a card list out of raw response text."""
+        try:
+            cleaned_text = utils.extract_json_payload(raw_text)
+            # orjson parses large responses severalfold faster than stdlib.
+            cards = orjson.loads(cleaned_text) if orjson is not None else json.loads(cleaned_text)
+            print(f"[claude] Generated {len(cards)} cards")
+            return cards
+        except json.JSONDecodeError as e:
+            print(f"[claude] JSON parsing failed: {e}")
+            return None
+
+    def process_pdfs_batch(self, pdf_paths, prompt_text):
+        """
+        Process several PDFs as a single Message Batches API job.
+
+        All PDFs are submitted in one batch (processed asynchronously
+        server-side at a 50% token discount), then the batch is polled
+        until it ends and results are mapped back to their PDFs.
+
+        Args:
+            pdf_paths: List of PDF file paths
+            prompt_text: Prompt to send to Claude
+
+        Returns:
+            Dict mapping each pdf_path to its card list (or None on error)
+        """
+        if not pdf_paths:
+            return {}
+
+        results = {path: None for path in pdf_paths}
+
+        try:
+            # custom_id is restricted to [a-zA-Z0-9_-], so key by index.
+            requests = [
+                {
+                    "custom_id": f"pdf-{index}",
+                    "params": self._build_message_params(path, prompt_text),
+                }
+                for index, path in enumerate(pdf_paths)
+            ]
+
+            print(f"[claude] Submitting batch of {len(requests)} request(s)...")
+            batch = self.client.messages.batches.create(requests=requests)
+
+            # Poll with exponential backoff until the batch has ended.
+            start_time = time.time()
+            poll_delay = self.retry_delay
+            poll_failures = 0
+            while True:
+                try:
+                    batch = self.client.messages.batches.retrieve(batch.id)
+                except Exception as exc:
+                    # A transient poll failure shouldn't abandon a batch
+                    # that is still running server-side.
+                    poll_failures += 1
+                    if not utils.is_retryable_error(exc) or poll_failures >= self.max_retries:
+                        raise
+                    delay = utils.get_retry_after(exc) or utils.compute_backoff(poll_failures)
+                    print(
+                        f"[claude] Poll error (attempt {poll_failures}/{self.max_retries}): {exc}; "
+                        f"retrying in {delay:.1f}s..."
+                    )
+                    time.sleep(delay)
+                    continue
+                poll_failures = 0
+                if batch.processing_status == "ended":
+                    break
+                elapsed = time.time() - start_time
+                print(
+                    f"[claude] Batch {batch.processing_status} after {elapsed:.0f}s; "
+                    f"polling again in {poll_delay:.0f}s..."
+                )
+                time.sleep(poll_delay)
+                poll_delay = min(poll_delay * 2, 60)
+
+            elapsed = time.time() - start_time
+            print(f"[claude] Batch completed in {elapsed:.1f}s")
+
+            failed_paths = []
+            for entry in self.client.messages.batches.results(batch.id):
+                index = int(entry.custom_id.split("-", 1)[1])
+                path = pdf_paths[index]
+                if entry.result.type == "succeeded":
+                    raw_text = self._extract_text(entry.result.message)
+                    results[path] = self._parse_cards(raw_text)
+                else:
+                    print(f"[claude] Batch request for {path} ended as {entry.result.type}")
+                    failed_paths.append(path)
+
+            # Errored/expired entries are often transient; give them the
+            # per-PDF path, which still carries retry/backoff, instead of
+            # failing them for the whole run.
+            if failed_paths:
+                print(f"[claude] Retrying {len(failed_paths)} failed batch request(s) individually...")
+                for path in failed_paths:
+                    results[path] = self.process_pdf(path, prompt_text)
+
+        except Exception as exc:
+            # Batch-level failure (submit rejected, poll exhausted, results
+            # fetch failed): fall back to the per-PDF thread-pool path so
+            # one bad batch doesn't fail the whole run.
+            print(f"[claude] Batch processing failed: {exc}")
+            print(f"[claude] Falling back to individual requests for {len(pdf_paths)} PDF(s)...")
+            return super().process_pdfs_batch(pdf_paths, prompt_text)
+
+        return results
+
     def process_pdf(self, pdf_path, prompt_text):
         """
         Process a PDF using Claude API.
@@ -42,63 +200,37 @@ class ClaudeBackend(AIBackend):
         """
         for attempt in range(1, self.max_retries + 1):
             try:
-                # Read and encode PDF
-                with open(pdf_path, "rb") as pdf_file:
-                    pdf_data = pdf_file.read()
-
                 # Create stream with PDF attachment
                 start_time = time.time()
-                stream = self.client.messages.create(
-                    model=self.model_name,
-                    max_tokens=64000,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "document",
-                                    "source": {
-                                        "type": "base64",
-                                        "media_type": "application/pdf",
-                                        "data": base64.b64encode(pdf_data).decode("utf-8"),
-                                    },
-                                },
-                                {
-                                    "type": "text",
-                                    "text": prompt_text,
-                                },
-                            ],
-                        }
-                    ],
-                    stream=True,
-                )
-
-                # Collect streamed response
-                raw_text = ""
-                chunk_count = 0
-                for event in stream:
-                    if event.type == "content_block_delta":
-                        if hasattr(event.delta, "text"):
-                            raw_text += event.delta.text
-                            chunk_count += 1
+                with self._throttle():
+                    stream = self.client.messages.create(
+                        stream=True,
+                        **self._build_message_params(pdf_path, prompt_text),
+                    )
+
+                    # Collect streamed response; joining once at the end avoids
+                    # the quadratic cost of repeated str concatenation.
+                    parts = []
+                    chunk_count = 0
+                    for event in stream:
+                        if event.type == "content_block_delta":
+                            if hasattr(event.delta, "text"):
+                                parts.append(event.delta.text)
+                                chunk_count += 1
+                    raw_text = "".join(parts)
 
                 elapsed_time = time.time() - start_time
                 print(f"[claude] Received {chunk_count} stream chunks in {elapsed_time:.1f}s")
 
                 # Parse JSON from response
-                try:
-                    cleaned_text = utils.extract_json_payload(raw_text)
-                    cards = json.loads(cleaned_text)
-                    print(f"[claude] Generated {len(cards)} cards")
-                    return cards
-                except json.JSONDecodeError as e:
-                    print(f"[claude] JSON parsing failed: {e}")
-                    return None
+                return self._parse_cards(raw_text)
 
             except Exception as exc:
                 print(f"[claude] Error (attempt {attempt}/{self.max_retries}): {exc}")
                 if utils.is_retryable_error(exc) and attempt < self.max_retries:
-                    time.sleep(self.retry_delay)
+                    delay = utils.get_retry_after(exc) or utils.compute_backoff(attempt)
+                    print(f"[claude] Retrying in {delay:.1f}s...")
+                    time.sleep(delay)
                     continue
                 return None
 
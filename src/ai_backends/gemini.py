@@ -1,11 +1,22 @@
 """Gemini AI backend implementation."""
 
+import asyncio
 import json
+import threading
 import time
 from google import genai
-from .. import utils
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from .. import config, utils
 from .base import AIBackend
 
+# Uploads are capped separately from generations so that uploading the
+# next PDFs overlaps with generations already in flight.
+MAX_CONCURRENT_UPLOADS = 4
+
 
 class GeminiBackend(AIBackend):
     """Gemini API backend for processing PDFs."""
@@ -13,6 +24,7 @@ class GeminiBackend(AIBackend):
     def __init__(self, api_key, model_name="gemini-2.5-pro", **kwargs):
         super().__init__(api_key, model_name, **kwargs)
         self.client = genai.Client(api_key=api_key)
+        self._upload_sem = threading.Semaphore(MAX_CONCURRENT_UPLOADS)
 
     def _extract_text(self, response):
         """Extract text from Gemini response."""
@@ -44,6 +56,41 @@ class GeminiBackend(AIBackend):
             # Some SDK versions use "path" instead of "file"
             return self.client.files.upload(path=path)
 
+    def process_pdfs_batch(self, pdf_paths, prompt_text):
+        """
+        Process several PDFs concurrently via asyncio.
+
+        The synchronous SDK calls are dispatched to worker threads with
+        asyncio.to_thread and fanned out with asyncio.gather; the upload
+        semaphore and the backend-wide throttle inside process_pdf keep
+        us under the provider's rate limits while letting uploads for
+        queued PDFs proceed behind in-flight generations.
+
+        Args:
+            pdf_paths: List of PDF file paths
+            prompt_text: Prompt to send to Gemini
+
+        Returns:
+            Dict mapping each pdf_path to its card list (or None on error)
+        """
+        if not pdf_paths:
+            return {}
+
+        async def process_all():
+            card_lists = await asyncio.gather(
+                *(
+                    asyncio.to_thread(self.process_pdf, path, prompt_text)
+                    for path in pdf_paths
+                )
+            )
+            return dict(zip(pdf_paths, card_lists))
+
+        print(
+            f"[gemini] Processing {len(pdf_paths)} PDF(s) with up to "
+            f"{config.AI_MAX_INFLIGHT} concurrent requests..."
+        )
+        return asyncio.run(process_all())
+
     def process_pdf(self, pdf_path, prompt_text):
         """
         Process a PDF using Gemini API.
@@ -57,29 +104,44 @@ class GeminiBackend(AIBackend):
         """
         for attempt in range(1, self.max_retries + 1):
             try:
-                # Upload PDF
-                print(f"[gemini] Uploading PDF...")
-                upload_start = time.time()
-                uploaded_file = self._upload_file(pdf_path)
-                upload_time = time.time() - upload_start
-                print(f"[gemini] PDF uploaded in {upload_time:.1f}s")
-
-                # Generate response
-                print(f"[gemini] Generating content...")
-                gen_start = time.time()
-                response = self.client.models.generate_content(
-                    model=self.model_name,
-                    contents=[uploaded_file, prompt_text],
-                )
-                gen_time = time.time() - gen_start
-                print(f"[gemini] Content generated in {gen_time:.1f}s")
-
-                raw_text = self._extract_text(response)
+                # Upload PDF; only the upload cap is held here so uploads
+                # overlap with generations already occupying throttle slots.
+                with self._upload_sem:
+                    print(f"[gemini] Uploading PDF...")
+                    upload_start = time.time()
+                    uploaded_file = self._upload_file(pdf_path)
+                    upload_time = time.time() - upload_start
+                    print(f"[gemini] PDF uploaded in {upload_time:.1f}s")
+
+                # Generate response, streamed so text assembly overlaps the
+                # network receive and a stuck response surfaces early.
+                with self._throttle():
+                    print(f"[gemini] Generating content...")
+                    gen_start = time.time()
+                    stream = self.client.models.generate_content_stream(
+                        model=self.model_name,
+                        contents=[uploaded_file, prompt_text],
+                    )
+
+                    parts = []
+                    first_chunk_time = None
+                    for chunk in stream:
+                        chunk_text = getattr(chunk, "text", None)
+                        if chunk_text:
+                            if first_chunk_time is None:
+                                first_chunk_time = time.time() - gen_start
+                                print(f"[gemini] First chunk after {first_chunk_time:.1f}s")
+                            parts.append(chunk_text)
+                    raw_text = "".join(parts)
+
+                    gen_time = time.time() - gen_start
+                    print(f"[gemini] Content generated in {gen_time:.1f}s")
 
                 # Parse JSON from response
                 try:
                     cleaned_text = utils.extract_json_payload(raw_text)
-                    cards = json.loads(cleaned_text)
+                    # orjson parses large responses severalfold faster than stdlib.
+                    cards = orjson.loads(cleaned_text) if orjson is not None else json.loads(cleaned_text)
                     print(f"[gemini] Generated {len(cards)} cards")
                     return cards
                 except json.JSONDecodeError:
@@ -89,7 +151,9 @@ class GeminiBackend(AIBackend):
             except Exception as exc:
                 print(f"[gemini] Error (attempt {attempt}/{self.max_retries}): {exc}")
                 if utils.is_retryable_error(exc) and attempt < self.max_retries:
-                    time.sleep(self.retry_delay)
+                    delay = utils.get_retry_after(exc) or utils.compute_backoff(attempt)
+                    print(f"[gemini] Retrying in {delay:.1f}s...")
+                    time.sleep(delay)
                     continue
                 return None
 
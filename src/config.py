@@ -20,6 +20,7 @@ JSON_DONE_DIR = os.path.join(JSON_DIR, "DONE")
 CSV_DIR = os.path.join(BASE_DIR, "data", "csv")
 CSV_DONE_DIR = os.path.join(CSV_DIR, "DONE")
 ERROR_DIR = os.path.join(BASE_DIR, "data", "error")
+CACHE_DIR = os.path.join(BASE_DIR, "data", "cache")
 
 # Prompts directory
 PROMPTS_DIR = os.path.join(BASE_DIR, "prompts")
@@ -32,13 +33,16 @@ CLAUDE_MODEL = os.getenv("CLAUDE_MODEL", "claude-sonnet-4-5-20250929")
 DEFAULT_PROMPT = os.getenv("DEFAULT_PROMPT", "ClaudeForGemini_NoSource")
 
 # Pipeline Configuration
+AI_MAX_INFLIGHT = int(os.getenv("AI_MAX_INFLIGHT", "4"))  # Max concurrent AI requests
+AI_RPS = float(os.getenv("AI_RPS", "2"))  # Max AI requests started per second
 MAX_RETRIES = 3
 RETRY_DELAY_SECONDS = 5
 PDF_COMPRESSION_SIZE_MB = 50
 PDF_COMPRESSION_SIZE_BYTES = PDF_COMPRESSION_SIZE_MB * 1024 * 1024
 PDF_CHUNK_MIN_PAGES = int(os.getenv("PDF_CHUNK_MIN_PAGES", "25"))
 PDF_CHUNK_MAX_PAGES = int(os.getenv("PDF_CHUNK_MAX_PAGES", "40"))  # Hard limit for token constraints
+DEBUG = os.getenv("ANKIAMOUR_DEBUG", "") == "1"  # Per-file logging in hot loops
 
 # Ensure all directories exist
-for directory in [RAW_SLIDES_DIR, RAW_SLIDES_DONE_DIR, SLIDES_DIR, SLIDES_DONE_DIR, JSON_DIR, JSON_DONE_DIR, CSV_DIR, CSV_DONE_DIR, ERROR_DIR, PROMPTS_DIR]:
+for directory in [RAW_SLIDES_DIR, RAW_SLIDES_DONE_DIR, SLIDES_DIR, SLIDES_DONE_DIR, JSON_DIR, JSON_DONE_DIR, CSV_DIR, CSV_DONE_DIR, ERROR_DIR, CACHE_DIR, PROMPTS_DIR]:
     os.makedirs(directory, exist_ok=True)
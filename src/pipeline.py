@@ -5,116 +5,179 @@ import shutil
 from .processors import sanitizer
 from .processors.ai_processor import run as run_ai_processor
 from .processors.json_converter import run as run_json_converter
-from .processors.csv_merger import run as run_csv_merger
 from . import config
 
 
-def _cleanup_json_files():
-    """Delete all files in the json directory."""
-    if os.path.isdir(config.JSON_DIR):
-        for filename in os.listdir(config.JSON_DIR):
-            if filename == "DONE":
-                continue
-            file_path = os.path.join(config.JSON_DIR, filename)
+def _move_file(src, dst):
+    """Move a file, preferring an atomic zero-copy rename.
+
+    Within the data/ tree source and destination share a filesystem, so
+    os.replace is a single rename; shutil.move only serves as the
+    cross-device fallback (it copies then deletes).
+    """
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.move(src, dst)
+
+
+def _dir_has_entries(path, predicate=None):
+    """Cheap emptiness probe: returns on the first interesting entry.
+
+    Costs a single getdents call when the directory is empty, instead of
+    a full scan plus per-file work in the helper it gates.
+    """
+    if not os.path.isdir(path):
+        return False
+    with os.scandir(path) as entries:
+        if predicate is None:
+            return next(entries, None) is not None
+        return any(predicate(entry) for entry in entries)
+
+
+def _not_done(entry):
+    """Entry predicate: anything except the DONE subdirectory."""
+    return entry.name != "DONE"
+
+
+def _scan_entries(path, predicate=None):
+    """Materialize one directory scan for fan-out to multiple helpers.
+
+    DirEntry objects carry cached type info from the single getdents, so
+    each consumer avoids re-listing the directory and re-stat'ing files.
+    """
+    if predicate is None:
+        predicate = _not_done
+    if not os.path.isdir(path):
+        return []
+    with os.scandir(path) as entries:
+        return [entry for entry in entries if predicate(entry)]
+
+
+def _cleanup_entries(entries):
+    """Delete the given directory entries (files and subtrees)."""
+    deleted = 0
+    for entry in entries:
+        try:
+            if entry.is_file(follow_symlinks=False):
+                os.remove(entry.path)
+            elif entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            deleted += 1
+        except Exception as e:
+            print(f"[pipeline] Warning: Could not delete {entry.path}: {e}")
+    if deleted:
+        print(f"[pipeline] Deleted {deleted} entr{'y' if deleted == 1 else 'ies'}")
+
+
+def _move_entries(entries, done_dir, label):
+    """Move the given file entries into done_dir.
+
+    Destination names are checked against a set loaded with one scandir
+    instead of stat'ing the destination per move; collisions get a _2,
+    _3, ... suffix so os.replace never clobbers an earlier run's file.
+    """
+    os.makedirs(done_dir, exist_ok=True)
+    done_dir_s = done_dir + os.sep
+    with os.scandir(done_dir) as existing:
+        taken = {existing_entry.name for existing_entry in existing}
+    moved = 0
+    failed = 0
+    for entry in entries:
+        if entry.is_file(follow_symlinks=False):
+            name = entry.name
+            if name in taken:
+                base, ext = os.path.splitext(name)
+                counter = 2
+                while name in taken:
+                    name = f"{base}_{counter}{ext}"
+                    counter += 1
             try:
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
-                elif os.path.isdir(file_path):
-                    shutil.rmtree(file_path)
+                _move_file(entry.path, done_dir_s + name)
+                taken.add(name)
+                moved += 1
+                # One summary line per phase keeps stdout writes off the
+                # per-file path; opt back in per file when debugging.
+                if config.DEBUG:
+                    print(f"[pipeline] Moved {entry.name} to {label}")
             except Exception as e:
-                print(f"[pipeline] Warning: Could not delete {file_path}: {e}")
+                failed += 1
+                print(f"[pipeline] Warning: Could not move {entry.name}: {e}")
+    summary = f"[pipeline] Moved {moved} file(s) to {label}"
+    if failed:
+        summary += f" ({failed} failed)"
+    print(summary)
+
+
+def _cleanup_json_files():
+    """Delete all files in the json directory."""
+    _cleanup_entries(_scan_entries(config.JSON_DIR))
 
 
 def _move_json_to_done():
     """Move all JSON files from json/ to json/DONE/."""
-    if os.path.isdir(config.JSON_DIR):
-        for filename in os.listdir(config.JSON_DIR):
-            if filename == "DONE":
-                continue
-            file_path = os.path.join(config.JSON_DIR, filename)
-            if os.path.isfile(file_path):
-                done_path = os.path.join(config.JSON_DONE_DIR, filename)
-                try:
-                    shutil.move(file_path, done_path)
-                    print(f"[pipeline] Moved {filename} to json/DONE/")
-                except Exception as e:
-                    print(f"[pipeline] Warning: Could not move {filename}: {e}")
+    _move_entries(_scan_entries(config.JSON_DIR), config.JSON_DONE_DIR, "json/DONE/")
 
 
 def _move_processed_slides_to_done():
     """Move all processed PDF files from slides/ to slides/DONE/."""
-    if os.path.isdir(config.SLIDES_DIR):
-        for filename in os.listdir(config.SLIDES_DIR):
-            if filename == "DONE":
-                continue
-            file_path = os.path.join(config.SLIDES_DIR, filename)
-            if os.path.isfile(file_path):
-                done_path = os.path.join(config.SLIDES_DONE_DIR, filename)
-                try:
-                    shutil.move(file_path, done_path)
-                    print(f"[pipeline] Moved {filename} to slides/DONE/")
-                except Exception as e:
-                    print(f"[pipeline] Warning: Could not move {filename}: {e}")
+    _move_entries(
+        _scan_entries(config.SLIDES_DIR), config.SLIDES_DONE_DIR, "slides/DONE/"
+    )
 
 
 def _move_raw_slides_to_done():
     """Move all processed PDF files from raw_slides/ to raw_slides/DONE/."""
-    if os.path.isdir(config.RAW_SLIDES_DIR):
-        for filename in os.listdir(config.RAW_SLIDES_DIR):
-            if filename == "DONE":
-                continue
-            file_path = os.path.join(config.RAW_SLIDES_DIR, filename)
-            if os.path.isfile(file_path):
-                done_path = os.path.join(config.RAW_SLIDES_DONE_DIR, filename)
-                try:
-                    shutil.move(file_path, done_path)
-                    print(f"[pipeline] Moved {filename} to raw_slides/DONE/")
-                except Exception as e:
-                    print(f"[pipeline] Warning: Could not move {filename}: {e}")
-
-
-def _cleanup_csv_files():
-    """Delete all CSV files in the csv directory (except in DONE subfolder)."""
-    if os.path.isdir(config.CSV_DIR):
-        for filename in os.listdir(config.CSV_DIR):
-            if filename == "DONE":
-                continue
-            if filename.lower().endswith(".csv"):
-                file_path = os.path.join(config.CSV_DIR, filename)
-                try:
-                    if os.path.isfile(file_path):
-                        os.remove(file_path)
-                except Exception as e:
-                    print(f"[pipeline] Warning: Could not delete {file_path}: {e}")
+    _move_entries(
+        _scan_entries(config.RAW_SLIDES_DIR),
+        config.RAW_SLIDES_DONE_DIR,
+        "raw_slides/DONE/",
+    )
 
 
-def _move_all_csv_to_done():
-    """Move all CSV files from csv/ to csv/DONE/."""
+def _finalize_csv_dir(merged_filename):
+    """Move the merged deck to csv/DONE/ and delete the remaining CSVs.
+
+    One scandir pass decides per entry whether to move or delete, instead
+    of scanning the directory once for the merged deck and again for the
+    per-file CSV cleanup.
+    """
     if os.path.isdir(config.CSV_DIR):
-        for filename in os.listdir(config.CSV_DIR):
-            if filename == "DONE":
-                continue
-            if filename.lower().endswith(".csv"):
-                file_path = os.path.join(config.CSV_DIR, filename)
-                if os.path.isfile(file_path):
-                    done_path = os.path.join(config.CSV_DONE_DIR, filename)
+        done_dir = config.CSV_DONE_DIR
+        os.makedirs(done_dir, exist_ok=True)
+        done_dir_s = done_dir + os.sep
+        with os.scandir(config.CSV_DIR) as entries:
+            for entry in entries:
+                if entry.name == "DONE" or not entry.is_file(follow_symlinks=False):
+                    continue
+                if entry.name == merged_filename:
                     try:
-                        shutil.move(file_path, done_path)
-                        print(f"[pipeline] Moved {filename} to csv/DONE/")
+                        _move_file(entry.path, done_dir_s + entry.name)
+                        print(f"[pipeline] Moved {entry.name} to csv/DONE/")
                     except Exception as e:
-                        print(f"[pipeline] Warning: Could not move {filename}: {e}")
+                        print(f"[pipeline] Warning: Could not move {entry.name}: {e}")
+                elif entry.name[-4:].lower() == ".csv":
+                    try:
+                        os.remove(entry.path)
+                    except Exception as e:
+                        print(f"[pipeline] Warning: Could not delete {entry.path}: {e}")
 
 
-def _move_merged_deck(merged_filename):
-    """Move merged CSV file from csv/ to csv/DONE/."""
-    file_path = os.path.join(config.CSV_DIR, merged_filename)
-    if os.path.isfile(file_path):
-        done_path = os.path.join(config.CSV_DONE_DIR, merged_filename)
-        try:
-            shutil.move(file_path, done_path)
-            print(f"[pipeline] Moved {merged_filename} to csv/DONE/")
-        except Exception as e:
-            print(f"[pipeline] Warning: Could not move {merged_filename}: {e}")
+def _is_csv_entry(entry):
+    """Entry predicate: non-DONE .csv files.
+
+    Lowercases only the 4-byte suffix rather than copying the whole name.
+    """
+    return entry.name != "DONE" and entry.name[-4:].lower() == ".csv"
+
+
+def _move_all_csv_to_done():
+    """Move all CSV files from csv/ to csv/DONE/."""
+    _move_entries(
+        _scan_entries(config.CSV_DIR, _is_csv_entry),
+        config.CSV_DONE_DIR,
+        "csv/DONE/",
+    )
 
 
 def run(
@@ -125,6 +188,7 @@ def run(
     skip_sanitize=False,
     cleanup=True,
     compare_mode=False,
+    resume=True,
 ):
     """
     Run the full AnkiAmour pipeline.
@@ -137,6 +201,7 @@ def run(
         skip_sanitize: Skip file sanitization step if True
         cleanup: Delete intermediate files (JSON and individual CSVs) if True (default)
         compare_mode: If True, don't move files to DONE folders (for comparing prompts)
+        resume: Skip PDFs whose JSON output survived a previous run (default)
     """
     print("=" * 60)
     print("AnkiAmour Pipeline Starting")
@@ -153,37 +218,31 @@ def run(
     # Step 2: PDF to JSON
     print("\nStep 2/4: Converting PDFs to JSON...")
     try:
-        run_ai_processor(prompt_name, backend_type=backend_type, tag_prefix=tag_prefix)
+        run_ai_processor(
+            prompt_name,
+            backend_type=backend_type,
+            tag_prefix=tag_prefix,
+            resume=resume,
+        )
     except Exception as exc:
         print(f"[pipeline] PDF to JSON failed: {exc}")
         return
 
-    # Step 3: JSON to CSV
-    print("\nStep 3/4: Converting JSON to CSV...")
+    # Steps 3+4 fused: the converter appends each deck to the master CSV
+    # as it is produced, so the separate merge pass (which re-read every
+    # per-deck CSV from disk) is no longer needed.
+    if merge_output is not None:
+        print("\nStep 3/4: Converting JSON to CSV (merging as we go)...")
+    else:
+        print("\nStep 3/4: Converting JSON to CSV...")
     try:
-        run_json_converter()
+        merged_filename = run_json_converter(merge_output=merge_output)
     except Exception as exc:
         print(f"[pipeline] JSON to CSV failed: {exc}")
         return
 
-    # Step 4: Merge (optional)
-    merged_filename = None
     if merge_output is not None:
-        print("\nStep 4/4: Merging CSV files...")
-        try:
-            run_csv_merger(merge_output)
-            # Determine the merged filename for cleanup later
-            if merge_output:
-                merged_filename = (
-                    merge_output
-                    if merge_output.lower().endswith(".csv")
-                    else f"{merge_output}.csv"
-                )
-            else:
-                merged_filename = "_MASTERDECK.csv"
-        except Exception as exc:
-            print(f"[pipeline] CSV merge failed: {exc}")
-            return
+        print("\nStep 4/4: Merge fused into conversion step.")
     else:
         print("\nStep 4/4: Skipping CSV merge (not requested)...")
 
@@ -191,6 +250,9 @@ def run(
     if compare_mode:
         print("\nCompare mode: preserving JSON files...")
         pass  # Don't move or delete JSON files
+    elif not _dir_has_entries(config.JSON_DIR, _not_done):
+        # Common on reruns: nothing produced, so skip the scan+stat loop.
+        print("\nNo JSON files to clean up.")
     elif not cleanup:
         print("\nPreserving JSON files (moving to json/DONE/)...")
         _move_json_to_done()
@@ -208,11 +270,11 @@ def run(
             _move_processed_slides_to_done()
 
     # Step 7: Handle CSV files
-    if merge_output is not None:
-        print("\nMoving merged deck to csv/DONE/...")
-        _move_merged_deck(merged_filename)
-        print("Deleting individual CSV files...")
-        _cleanup_csv_files()
+    if not _dir_has_entries(config.CSV_DIR, _not_done):
+        print("\nNo CSV files to move.")
+    elif merge_output is not None:
+        print("\nMoving merged deck to csv/DONE/ and deleting individual CSV files...")
+        _finalize_csv_dir(merged_filename)
     else:
         print("\nMoving all CSV files to csv/DONE/...")
         _move_all_csv_to_done()
@@ -3,6 +3,11 @@
 import json
 import os
 import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from .. import config, utils, prompts
 from ..ai_backends.base import AIBackend
 from ..ai_backends.claude import ClaudeBackend
@@ -46,7 +51,21 @@ def get_backend(backend_type="claude"):
         raise ValueError(f"Unknown backend: {backend_type}")
 
 
-def run(prompt_name, backend_type="claude", tag_prefix=""):
+def _has_valid_json_output(pdf_base):
+    """Check whether a PDF already has a parseable JSON output from a prior run."""
+    json_path = os.path.join(config.JSON_DIR, f"{pdf_base}.json")
+    if not os.path.isfile(json_path):
+        return False
+
+    try:
+        with open(json_path, "r", encoding="utf-8") as handle:
+            json.load(handle)
+        return True
+    except (OSError, json.JSONDecodeError):
+        return False
+
+
+def run(prompt_name, backend_type="claude", tag_prefix="", resume=True):
     """
     Process PDFs to JSON using specified AI backend.
 
@@ -54,6 +73,7 @@ def run(prompt_name, backend_type="claude", tag_prefix=""):
         prompt_name: Name of prompt file (with or without .txt)
         backend_type: "claude" or "gemini"
         tag_prefix: Optional prefix for filename tags
+        resume: Skip PDFs whose JSON output already exists and is valid
     """
     print(f"[ai_processor] Starting {backend_type.upper()} processing of slides...")
 
@@ -83,46 +103,70 @@ def run(prompt_name, backend_type="claude", tag_prefix=""):
     pdf_files = utils.get_pdf_files(config.SLIDES_DIR)
     print(f"[ai_processor] Found {len(pdf_files)} PDF file(s) to process.")
 
+    # Snapshot existing outputs once; the per-file resume check then costs
+    # a set probe instead of a stat, and only probable hits pay for the
+    # JSON parse that confirms the output is actually usable.
+    already_done = set()
+    if resume and os.path.isdir(config.JSON_DIR):
+        with os.scandir(config.JSON_DIR) as entries:
+            already_done = {
+                entry.name for entry in entries if entry.name.endswith(".json")
+            }
+
+    # Phase 1: inspect each PDF, chunking large ones, to build the list of
+    # paths to submit in one batch.
+    jobs = []  # (filename, pdf_base, paths) where paths are the units to send
     for index, filename in enumerate(pdf_files, start=1):
-        print(f"[ai_processor] ({index}/{len(pdf_files)}) Processing {filename}")
+        print(f"[ai_processor] ({index}/{len(pdf_files)}) Preparing {filename}")
 
         pdf_path = os.path.join(config.SLIDES_DIR, filename)
         pdf_base = os.path.splitext(filename)[0]
-        pdf_tag = utils.sanitize_tag(pdf_base)
-        combined_tag = f"{tag_prefix}{pdf_tag}" if tag_prefix else pdf_tag
 
-        # Check if PDF needs chunking
-        from pypdf import PdfReader
-        reader = PdfReader(pdf_path)
-        total_pages = len(reader.pages)
+        # Resume: don't re-send PDFs that already have valid output from
+        # an interrupted or earlier run.
+        if f"{pdf_base}.json" in already_done and _has_valid_json_output(pdf_base):
+            print(f"[ai_processor] Skipping {filename}: valid JSON output already exists.")
+            continue
+
+        # Check if PDF needs chunking; the memoized reader is shared with
+        # the chunking step so the xref is parsed once per file.
+        reader = chunking.get_reader(pdf_path)
+        total_pages = reader.get_num_pages()
         print(f"[ai_processor] PDF has {total_pages} pages")
 
-        # Chunk if necessary
         if total_pages > config.PDF_CHUNK_MAX_PAGES:
             print(f"[ai_processor] PDF exceeds max pages ({config.PDF_CHUNK_MAX_PAGES}), chunking...")
-            chunks = chunking.chunk_pdf(pdf_path)
-            all_cards = []
-            
-            for chunk_idx, chunk_path in enumerate(chunks, start=1):
-                print(f"[ai_processor] Processing chunk {chunk_idx}/{len(chunks)}...")
-                chunk_start = time.time()
-                
-                cards = backend.process_pdf(chunk_path, prompt_text)
-                
-                chunk_time = time.time() - chunk_start
-                if cards:
-                    print(f"[ai_processor] Chunk {chunk_idx} completed in {chunk_time:.1f}s with {len(cards)} cards")
-                    all_cards.extend(cards)
-                else:
-                    print(f"[ai_processor] Chunk {chunk_idx} failed or returned no cards")
-                    
-            cards = all_cards if all_cards else None
+            paths = chunking.chunk_pdf(pdf_path, reader=reader)
+        else:
+            paths = [pdf_path]
+
+        jobs.append((filename, pdf_base, paths))
+
+    # Phase 2: submit every PDF (and chunk) in a single batch so the backend
+    # can fan them out concurrently instead of serializing latencies.
+    all_paths = [path for _, _, paths in jobs for path in paths]
+    batch_start = time.time()
+    results = backend.process_pdfs_batch_cached(all_paths, prompt_text)
+    batch_time = time.time() - batch_start
+    print(f"[ai_processor] Batch of {len(all_paths)} request(s) completed in {batch_time:.1f}s")
+
+    # The prefix is constant across the run, so the branch is decided once
+    # here instead of per file.
+    if tag_prefix:
+        _mk_tag = lambda base: tag_prefix + utils.sanitize_tag(base)
+    else:
+        _mk_tag = utils.sanitize_tag
+
+    # Phase 3: reassemble per-PDF card lists, validate, tag, and write.
+    for filename, pdf_base, paths in jobs:
+        print(f"[ai_processor] Collecting results for {filename}")
+
+        combined_tag = _mk_tag(pdf_base)
+
+        if len(paths) == 1:
+            cards = results.get(paths[0])
         else:
-            print(f"[ai_processor] Processing as single file...")
-            process_start = time.time()
-            cards = backend.process_pdf(pdf_path, prompt_text)
-            process_time = time.time() - process_start
-            print(f"[ai_processor] Processing completed in {process_time:.1f}s")
+            cards = backend.stitch_chunk_results(paths, results)
 
         if cards is None:
             utils.log_error(
@@ -135,9 +179,10 @@ def run(prompt_name, backend_type="claude", tag_prefix=""):
             print(f"[ai_processor] Skipping {filename} due to API error.")
             continue
 
-        # Validate response
-        validated_cards, error_msg = backend.validate_response(cards)
-        if validated_cards is None:
+        # Validate, normalize, and tag in a single pass over the card list
+        # instead of one full traversal per step.
+        tagged_cards, error_msg = backend.validate_and_tag_response(cards, combined_tag)
+        if tagged_cards is None:
             utils.log_error(
                 config.ERROR_DIR,
                 "ai_processor.py",
@@ -163,8 +208,6 @@ def run(prompt_name, backend_type="claude", tag_prefix=""):
             except (json.JSONDecodeError, TypeError):
                 pass  # error_msg is not correction info, skip logging
 
-        # Add file tag
-        tagged_cards = backend.add_file_tag(validated_cards, combined_tag)
         print(f"[ai_processor] Added tag '{combined_tag}' to {len(tagged_cards)} cards")
 
         # Write output
@@ -172,8 +215,13 @@ def run(prompt_name, backend_type="claude", tag_prefix=""):
         json_output_path = os.path.join(config.JSON_DIR, json_output_name)
 
         try:
-            with open(json_output_path, "w", encoding="utf-8") as handle:
-                json.dump(tagged_cards, handle, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                # orjson serializes in C and the result lands in one write.
+                with open(json_output_path, "wb") as handle:
+                    handle.write(orjson.dumps(tagged_cards, option=orjson.OPT_INDENT_2))
+            else:
+                with open(json_output_path, "w", encoding="utf-8") as handle:
+                    json.dump(tagged_cards, handle, ensure_ascii=False, indent=2)
         except OSError as exc:
             utils.log_error(
                 config.ERROR_DIR,
@@ -1,37 +1,56 @@
 """CSV merge processor."""
 
 import os
+import re
+import shutil
+from operator import itemgetter
 from .. import config, utils
 
 
-def is_excluded_master(name, base_name):
-    """Exclude existing master deck files that match the output base name."""
-    if not name.lower().endswith(".csv"):
-        return False
-
-    stem = os.path.splitext(name)[0]
-    if stem == base_name:
-        return True
-
-    # Exclude suffix variants like Base_2, Base_3, etc.
-    if stem.startswith(f"{base_name}_"):
-        suffix = stem[len(base_name) + 1 :]
-        return suffix.isdigit()
-
-    return False
-
-
 def unique_output_path(directory, filename):
     """Generate a unique output file path by appending _2, _3, etc. to the name."""
     base, ext = os.path.splitext(filename)
+    directory_s = directory + os.sep
+
+    # One directory snapshot instead of a stat syscall per collision probe.
+    with os.scandir(directory) as entries:
+        existing = {entry.name for entry in entries}
+
     candidate = filename
     counter = 2
 
-    while os.path.exists(os.path.join(directory, candidate)):
+    while candidate in existing:
         candidate = f"{base}_{counter}{ext}"
         counter += 1
 
-    return os.path.join(directory, candidate)
+    return directory_s + candidate
+
+
+def _copy_file_contents(in_handle, out_handle, size):
+    """Copy a whole open file into out_handle.
+
+    Prefers os.sendfile, which moves the bytes kernel-to-kernel without a
+    userspace bounce buffer; falls back to buffered copyfileobj where
+    sendfile is unavailable or rejects the file.
+    """
+    # Flush buffered writes first so raw-fd copies don't reorder past them.
+    out_handle.flush()
+
+    offset = 0
+    if hasattr(os, "sendfile"):
+        try:
+            while offset < size:
+                sent = os.sendfile(out_handle.fileno(), in_handle.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            if offset >= size:
+                return
+        except OSError:
+            pass
+
+    in_handle.seek(offset)
+    shutil.copyfileobj(in_handle, out_handle, length=1 << 20)
 
 
 def run(output_name=None):
@@ -50,40 +69,66 @@ def run(output_name=None):
 
     output_base = os.path.splitext(output_filename)[0]
 
-    def exclude_filter(name):
-        return is_excluded_master(name, output_base)
-
-    csv_files = utils.get_csv_files(config.CSV_DIR, exclude_pattern=exclude_filter)
-
-    if not csv_files:
+    # Exclude existing master decks matching the output base name,
+    # including suffix variants like Base_2.csv — one compiled-regex
+    # fullmatch per filename instead of splitext/startswith/isdigit.
+    exclude_pattern = re.compile(
+        rf"^{re.escape(output_base)}(?:_\d+)?\.csv$", re.IGNORECASE
+    )
+
+    # One scandir pass collects names and mtimes together; sorting then
+    # happens in memory instead of re-statting files per comparison.
+    with os.scandir(config.CSV_DIR) as entries:
+        candidates = [
+            (entry.name, entry.stat().st_mtime)
+            for entry in entries
+            if entry.is_file(follow_symlinks=False)
+            # Lowercase only the 4-byte suffix, not a copy of the whole name.
+            and entry.name[-4:].lower() == ".csv"
+            and not exclude_pattern.fullmatch(entry.name)
+        ]
+
+    if not candidates:
         print("[csv_merger] No CSV files found. Nothing to merge.")
         return
 
     # Order by modified time
-    csv_files.sort(key=lambda name: os.path.getmtime(os.path.join(config.CSV_DIR, name)))
+    candidates.sort(key=itemgetter(1))
+    csv_files = [name for name, _ in candidates]
 
     output_path = unique_output_path(config.CSV_DIR, output_filename)
 
     print(f"[csv_merger] Merging {len(csv_files)} file(s) into {output_path}.")
 
     try:
-        with open(output_path, "w", encoding="utf-8") as out_handle:
-            last_char = None
+        # Binary streaming: copyfileobj moves bytes through a fixed 1 MiB
+        # buffer, so there is no whole-file allocation and no UTF-8
+        # decode/encode round-trip per file.
+        csv_dir_s = config.CSV_DIR + os.sep
 
-            for name in csv_files:
-                input_path = os.path.join(config.CSV_DIR, name)
+        with open(output_path, "wb") as out_handle:
+            last_byte = b""
 
-                with open(input_path, "r", encoding="utf-8") as in_handle:
-                    content = in_handle.read()
-
-                # Insert a newline if the previous file did not end with one.
-                if last_char not in (None, "\n") and content:
-                    out_handle.write("\n")
-
-                out_handle.write(content)
-
-                if content:
-                    last_char = content[-1]
+            for name in csv_files:
+                # Internal paths rooted at our config dirs: plain string
+                # concat skips os.path.join's separator handling.
+                input_path = csv_dir_s + name
+
+                with open(input_path, "rb") as in_handle:
+                    # Peek at the final byte to drive the separator logic.
+                    size = in_handle.seek(0, os.SEEK_END)
+                    if size == 0:
+                        continue
+                    in_handle.seek(-1, os.SEEK_END)
+                    file_last_byte = in_handle.read(1)
+                    in_handle.seek(0)
+
+                    # Insert a newline if the previous file did not end with one.
+                    if last_byte not in (b"", b"\n"):
+                        out_handle.write(b"\n")
+
+                    _copy_file_contents(in_handle, out_handle, size)
+                    last_byte = file_last_byte
 
     except OSError as exc:
         utils.log_error(
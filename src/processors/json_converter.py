@@ -1,84 +1,210 @@
 """JSON to CSV conversion processor."""
 
-import csv
 import json
+import mmap
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from .. import config, utils
+from .csv_merger import unique_output_path
+
+# Characters that force quoting in the pipe-delimited deck format; matches
+# what csv.QUOTE_MINIMAL does for delimiter="|", lineterminator="\n".
+_QUOTE_TRIGGERS = ("|", '"', "\n")
+
+# Below this many files the worker-process spawn/pickle overhead outweighs
+# the parallel decode/format win, so conversion stays in-process.
+_PARALLEL_MIN_FILES = 4
+
+# Inputs at least this large are decoded straight from a memory map so the
+# file bytes aren't duplicated through a read() buffer first.
+_MMAP_MIN_BYTES = 1 << 20
+
+
+def _fmt_field(value):
+    """Render one field, quoting only when the format requires it."""
+    if not isinstance(value, str):
+        # csv.writer wrote None as an empty field; null card values pass
+        # validation (it only checks key presence), so match that here.
+        value = "" if value is None else str(value)
+    for ch in _QUOTE_TRIGGERS:
+        if ch in value:
+            return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _render_cards(cards):
+    """Render cards to one UTF-8 payload for a single write.
+
+    The fixed 3-column schema rarely needs quoting, so formatting rows
+    directly skips the csv module's per-field dialect machinery; the
+    generator feeds str.join's C loop straight from the card dicts, with
+    no intermediate row-tuple list, and the single join/encode replaces
+    a write per row.
+    """
+    return (
+        "\n".join(
+            f"{_fmt_field(card['main_content'])}"
+            f"|{_fmt_field(card['extra_field'])}"
+            f"|{_fmt_field(card['importance_value'])}"
+            for card in cards
+        ).encode("utf-8")
+        + b"\n"
+    )
+
+
+def _convert_one(filename):
+    """Convert one JSON deck to its per-deck CSV.
+
+    Runs in worker processes for large batches, so instead of touching
+    shared state it returns everything the parent needs: the rendered
+    payload (for the fused master-deck append) and any error message to
+    log.
+
+    Returns:
+        Tuple of (payload, card_count, error_message); payload is None
+        on failure.
+    """
+    json_path = os.path.join(config.JSON_DIR, filename)
+    csv_filename = f"{os.path.splitext(filename)[0]}.csv"
+    csv_path = os.path.join(config.CSV_DIR, csv_filename)
+
+    try:
+        if orjson is not None:
+            # orjson decodes in C, several times faster than the
+            # stdlib tokenizer on large card dumps.
+            with open(json_path, "rb") as handle:
+                if os.fstat(handle.fileno()).st_size >= _MMAP_MIN_BYTES:
+                    # Decode straight from the page cache; the view must be
+                    # released before the map closes.
+                    with mmap.mmap(
+                        handle.fileno(), 0, access=mmap.ACCESS_READ
+                    ) as mapped:
+                        view = memoryview(mapped)
+                        try:
+                            cards = orjson.loads(view)
+                        finally:
+                            view.release()
+                else:
+                    cards = orjson.loads(handle.read())
+        else:
+            with open(json_path, "r", encoding="utf-8") as handle:
+                cards = json.load(handle)
+    # orjson.JSONDecodeError subclasses ValueError (as does the
+    # stdlib's), so one clause covers both decoders.
+    except (OSError, ValueError) as exc:
+        return None, 0, f"Failed to read JSON: {exc}"
+
+    is_valid, validation_message, filtered_cards = utils.validate_required_fields(cards)
+    if not is_valid:
+        return None, 0, f"Invalid card structure: {validation_message}"
+
+    # Use filtered cards if some were invalid, otherwise use original
+    cards_to_write = filtered_cards if filtered_cards is not None else cards
+
+    payload = _render_cards(cards_to_write)
+
+    try:
+        # One preformatted payload per deck: a single binary write,
+        # no text-layer encode pass per row.
+        with open(csv_path, "wb") as handle:
+            handle.write(payload)
+    except OSError as exc:
+        return None, 0, f"Failed to write CSV: {exc}"
+
+    return payload, len(cards_to_write), None
+
+
+def run(merge_output=None):
+    """Convert JSON files to CSV files.
 
+    Files are independent and the work is CPU-bound on decode plus
+    formatting, so large batches fan out over a process pool; results
+    come back in submission order, which keeps the fused master-deck
+    append deterministic. Small batches stay in-process.
 
-def run():
-    """Convert JSON files to CSV files."""
+    Args:
+        merge_output: Optional master deck name; when given, each deck's
+            rows are also appended to the master CSV as they are produced,
+            fusing the separate merge pass (and its re-read of every
+            per-deck CSV) into this one. Merge order is processing order.
+
+    Returns:
+        The master deck filename when merge_output was given and at least
+        one deck was converted, otherwise None.
+    """
     print("[json_converter] Starting JSON to CSV conversion...")
 
     json_files = utils.get_json_files(config.JSON_DIR)
     print(f"[json_converter] Found {len(json_files)} JSON file(s) to process.")
 
-    for index, filename in enumerate(json_files, start=1):
-        print(f"[json_converter] ({index}/{len(json_files)}) Processing {filename}")
+    merged_filename = None
+    if merge_output is not None:
+        merged_filename = merge_output or "_MASTERDECK"
+        if not merged_filename.lower().endswith(".csv"):
+            merged_filename = f"{merged_filename}.csv"
 
-        json_path = os.path.join(config.JSON_DIR, filename)
-        csv_filename = f"{os.path.splitext(filename)[0]}.csv"
-        csv_path = os.path.join(config.CSV_DIR, csv_filename)
+    # Opened lazily on the first converted deck so an empty run leaves no
+    # empty master file behind.
+    master_handle = None
+    master_name = None
 
-        try:
-            with open(json_path, "r", encoding="utf-8") as handle:
-                cards = json.load(handle)
-        except (OSError, json.JSONDecodeError) as exc:
-            utils.log_error(
-                config.ERROR_DIR,
-                "json_converter.py",
-                f"Failed to read JSON: {exc}",
-                processed_file_name=filename,
-            )
-            print(f"[json_converter] Failed to read {filename}; skipping.")
-            continue
-
-        is_valid, validation_message, filtered_cards = utils.validate_required_fields(cards)
-        if not is_valid:
-            utils.log_error(
-                config.ERROR_DIR,
-                "json_converter.py",
-                f"Invalid card structure: {validation_message}",
-                processed_file_name=filename,
-            )
-            print(f"[json_converter] Invalid structure in {filename}; skipping file.")
-            continue
-        
-        # Use filtered cards if some were invalid, otherwise use original
-        cards_to_write = filtered_cards if filtered_cards is not None else cards
-        print(f"[json_converter] Converting {len(cards_to_write)} cards to CSV...")
-
-        try:
-            # newline="" avoids CSV writer adding extra blank lines on some platforms.
-            with open(csv_path, "w", encoding="utf-8", newline="") as handle:
-                writer = csv.writer(
-                    handle,
-                    delimiter="|",
-                    quoting=csv.QUOTE_MINIMAL,
-                    lineterminator="\n",
+    executor = None
+    if len(json_files) >= _PARALLEL_MIN_FILES:
+        executor = ProcessPoolExecutor()
+        # map preserves input order; workers re-import config themselves,
+        # so only filenames and payloads cross the process boundary.
+        outcomes = executor.map(_convert_one, json_files, chunksize=4)
+    else:
+        outcomes = map(_convert_one, json_files)
+
+    try:
+        for index, (filename, outcome) in enumerate(zip(json_files, outcomes), start=1):
+            print(f"[json_converter] ({index}/{len(json_files)}) Processing {filename}")
+            payload, card_count, error_message = outcome
+
+            if payload is None:
+                utils.log_error(
+                    config.ERROR_DIR,
+                    "json_converter.py",
+                    error_message,
+                    processed_file_name=filename,
                 )
+                print(f"[json_converter] {error_message.split(':')[0]} for {filename}; skipping.")
+                continue
+
+            csv_filename = f"{os.path.splitext(filename)[0]}.csv"
 
-                for card in cards_to_write:
-                    writer.writerow(
-                        [
-                            card["main_content"],
-                            card["extra_field"],
-                            card["importance_value"],
-                        ]
+            if merged_filename is not None:
+                try:
+                    if master_handle is None:
+                        master_path = unique_output_path(config.CSV_DIR, merged_filename)
+                        master_name = os.path.basename(master_path)
+                        master_handle = open(master_path, "wb", buffering=1 << 20)
+                        print(f"[json_converter] Appending decks to {master_name}.")
+                    master_handle.write(payload)
+                except OSError as exc:
+                    utils.log_error(
+                        config.ERROR_DIR,
+                        "json_converter.py",
+                        f"Failed to append to master deck: {exc}",
+                        processed_file_name=filename,
                     )
-        except OSError as exc:
-            utils.log_error(
-                config.ERROR_DIR,
-                "json_converter.py",
-                f"Failed to write CSV: {exc}",
-                processed_file_name=filename,
-            )
-            print(f"[json_converter] Failed to write CSV for {filename}.")
-            continue
-
-        print(f"[json_converter] ✓ Wrote {len(cards_to_write)} cards to {csv_filename}.")
+                    print(f"[json_converter] Failed to append {csv_filename} to master deck.")
+
+            print(f"[json_converter] ✓ Wrote {card_count} cards to {csv_filename}.")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if master_handle is not None:
+            master_handle.close()
 
     print("[json_converter] Conversion complete.")
+    return master_name
 
 
 if __name__ == "__main__":
@@ -1,13 +1,21 @@
 """File sanitization processor."""
 
+import functools
 import json
 import os
 import shutil
 import subprocess
 import tempfile
+import threading
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from .. import config, utils
 
+# Serializes error-dir name resolution + move across compression worker
+# threads; without it two failures sanitizing to the same name can pick
+# the same target and the second rename silently overwrites the first.
+_ERROR_DIR_LOCK = threading.Lock()
+
 
 TURKISH_CHAR_MAP = {
     "ç": "c",
@@ -25,26 +33,48 @@ TURKISH_CHAR_MAP = {
 }
 
 
+# Precompiled translation table: .translate() maps the Turkish characters
+# in one C loop instead of a per-character dict lookup in Python.
+_TR_TABLE = str.maketrans(TURKISH_CHAR_MAP)
+
+
 def strip_diacritics(text):
     """Remove combining diacritics while preserving base characters."""
+    # ASCII can't carry combining marks, and most filenames are ASCII;
+    # isascii() is an O(1) flag check on the str object.
+    if text.isascii():
+        return text
     normalized = unicodedata.normalize("NFKD", text)
     return "".join(ch for ch in normalized if unicodedata.category(ch) != "Mn")
 
 
+@functools.lru_cache(maxsize=1024)
 def sanitize_name(name):
-    """Apply Unicode normalization, Turkish character mapping, and space cleanup."""
-    without_marks = strip_diacritics(name)
-    mapped = "".join(TURKISH_CHAR_MAP.get(ch, ch) for ch in without_marks)
-    return mapped.replace(" ", "_")
+    """Apply Unicode normalization, Turkish character mapping, and space cleanup.
+
+    Memoized: the same base names recur across reruns and DONE-folder
+    reprocessing, and sanitization is pure.
+    """
+    return strip_diacritics(name).translate(_TR_TABLE).replace(" ", "_")
 
 
-def unique_path(directory, filename):
-    """Generate a unique path by appending _2, _3, etc. before the extension."""
+def unique_path(directory, filename, *, existing=None):
+    """Generate a unique path by appending _2, _3, etc. before the extension.
+
+    Candidates are resolved against a name set rather than one stat
+    syscall per probe. Callers placing many files in the same directory
+    should build the set once, pass it as `existing`, and add each
+    chosen name after moving; otherwise it is snapshotted per call.
+    """
+    if existing is None:
+        with os.scandir(directory) as entries:
+            existing = {entry.name for entry in entries}
+
     base, ext = os.path.splitext(filename)
     candidate = filename
     counter = 2
 
-    while os.path.exists(os.path.join(directory, candidate)):
+    while candidate in existing:
         candidate = f"{base}_{counter}{ext}"
         counter += 1
 
@@ -56,7 +86,8 @@ def compress_pdf(input_path, output_path):
     Compress a PDF using Ghostscript.
 
     Returns:
-        Tuple of (success, stderr_text)
+        Tuple of (success, stderr_text); only the last 4 KiB of stderr
+        is retained for error logging.
     """
     command = [
         "gs",
@@ -70,14 +101,85 @@ def compress_pdf(input_path, output_path):
         input_path,
     ]
 
-    result = subprocess.run(command, capture_output=True, text=True)
+    # Discard stdout and keep stderr as bytes: only the tail is decoded,
+    # so a chatty Ghostscript run doesn't buffer megabytes through a
+    # Python-level decode.
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
     success = (
         result.returncode == 0
         and os.path.exists(output_path)
         and os.path.getsize(output_path) > 0
     )
 
-    return success, result.stderr.strip()
+    return success, result.stderr[-4096:].decode("utf-8", "replace").strip()
+
+
+def _compress_and_move(filename, original_path, target_path, sanitized_filename, extension):
+    """Compress one oversized PDF and move the result into slides/.
+
+    Runs on a worker thread; prints carry the filename since output from
+    concurrent compressions interleaves.
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=config.RAW_SLIDES_DIR, delete=False, suffix=extension
+    ) as tmp_handle:
+        temp_output_path = tmp_handle.name
+
+    success, stderr_text = compress_pdf(original_path, temp_output_path)
+
+    if not success:
+        try:
+            with _ERROR_DIR_LOCK:
+                error_target = unique_path(config.ERROR_DIR, sanitized_filename)
+                shutil.move(original_path, error_target)
+        except OSError as exc:
+            utils.log_error(
+                config.ERROR_DIR,
+                "sanitizer.py",
+                f"Compression failed and move to error failed: {exc}",
+                processed_file_name=filename,
+                complete_ai_response=stderr_text,
+            )
+            if os.path.exists(temp_output_path):
+                os.remove(temp_output_path)
+            return
+
+        utils.log_error(
+            config.ERROR_DIR,
+            "sanitizer.py",
+            "Compression failed; file moved to error folder.",
+            processed_file_name=filename,
+            complete_ai_response=stderr_text,
+        )
+
+        if os.path.exists(temp_output_path):
+            os.remove(temp_output_path)
+        return
+
+    try:
+        shutil.move(temp_output_path, target_path)
+    except OSError as exc:
+        utils.log_error(
+            config.ERROR_DIR,
+            "sanitizer.py",
+            f"Compression succeeded but move to slides failed: {exc}",
+            processed_file_name=filename,
+        )
+        if os.path.exists(temp_output_path):
+            os.remove(temp_output_path)
+        return
+
+    try:
+        os.remove(original_path)
+    except OSError as exc:
+        utils.log_error(
+            config.ERROR_DIR,
+            "sanitizer.py",
+            f"Compressed file moved, but could not remove original: {exc}",
+            processed_file_name=filename,
+        )
+
+    print(f"[sanitizer] {filename}: compression complete and file moved to slides.")
 
 
 def run():
@@ -93,104 +195,75 @@ def run():
         print("[sanitizer] raw_slides folder not found. Aborting.")
         return
 
-    pdf_files = utils.get_pdf_files(config.RAW_SLIDES_DIR)
-    print(f"[sanitizer] Found {len(pdf_files)} PDF file(s) to process.")
+    # (name, size) pairs from one scan; the size branch below then needs
+    # no getsize syscall per file.
+    pdf_entries = utils.get_pdf_entries(config.RAW_SLIDES_DIR)
+    print(f"[sanitizer] Found {len(pdf_entries)} PDF file(s) to process.")
+
+    # One snapshot of the target directory; collision checks for every
+    # file in this run probe the set instead of stat'ing per candidate.
+    with os.scandir(config.SLIDES_DIR) as entries:
+        slides_taken = {entry.name for entry in entries}
 
-    for index, filename in enumerate(pdf_files, start=1):
-        print(f"[sanitizer] ({index}/{len(pdf_files)}) Processing {filename}")
+    compression_jobs = []
+
+    for index, (filename, file_size) in enumerate(pdf_entries, start=1):
+        print(f"[sanitizer] ({index}/{len(pdf_entries)}) Processing {filename}")
 
         original_path = os.path.join(config.RAW_SLIDES_DIR, filename)
         base_name, extension = os.path.splitext(filename)
 
         sanitized_base = sanitize_name(base_name)
         sanitized_filename = f"{sanitized_base}{extension}"
-        target_path = unique_path(config.SLIDES_DIR, sanitized_filename)
+        target_path = unique_path(
+            config.SLIDES_DIR, sanitized_filename, existing=slides_taken
+        )
+        slides_taken.add(os.path.basename(target_path))
+
+        if file_size > config.PDF_COMPRESSION_SIZE_BYTES:
+            print(f"[sanitizer] {filename} exceeds 50 MB, queueing for compression...")
+            compression_jobs.append(
+                (filename, original_path, target_path, sanitized_filename, extension)
+            )
+            continue
 
         try:
-            file_size = os.path.getsize(original_path)
+            shutil.move(original_path, target_path)
+            print("[sanitizer] File moved to slides without compression.")
         except OSError as exc:
             utils.log_error(
                 config.ERROR_DIR,
                 "sanitizer.py",
-                f"Unable to read file size: {exc}",
+                f"Move to slides failed: {exc}",
                 processed_file_name=filename,
             )
-            continue
 
-        if file_size > config.PDF_COMPRESSION_SIZE_BYTES:
-            print("[sanitizer] File exceeds 50 MB, attempting compression...")
-
-            with tempfile.NamedTemporaryFile(
-                dir=config.RAW_SLIDES_DIR, delete=False, suffix=extension
-            ) as tmp_handle:
-                temp_output_path = tmp_handle.name
-
-            success, stderr_text = compress_pdf(original_path, temp_output_path)
-
-            if not success:
-                error_target = unique_path(config.ERROR_DIR, sanitized_filename)
+    if compression_jobs:
+        # Ghostscript is single-threaded per invocation and the wrapper
+        # just blocks in subprocess.wait, so threads spread independent
+        # compressions across cores. Small files above never pay for the
+        # pool; they already moved on the main thread.
+        max_workers = min(len(compression_jobs), os.cpu_count() or 1)
+        print(f"[sanitizer] Compressing {len(compression_jobs)} file(s) on {max_workers} worker(s)...")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_compress_and_move, *job) for job in compression_jobs
+            ]
+            # _compress_and_move handles its own expected failures; consume
+            # each result so anything unexpected surfaces instead of dying
+            # silently with the future.
+            for job, future in zip(compression_jobs, futures):
                 try:
-                    shutil.move(original_path, error_target)
-                except OSError as exc:
+                    future.result()
+                except Exception as exc:
+                    filename = job[0]
+                    print(f"[sanitizer] Compression worker for {filename} failed: {exc}")
                     utils.log_error(
                         config.ERROR_DIR,
                         "sanitizer.py",
-                        f"Compression failed and move to error failed: {exc}",
+                        f"Compression worker failed unexpectedly: {exc}",
                         processed_file_name=filename,
-                        complete_ai_response=stderr_text,
                     )
-                    if os.path.exists(temp_output_path):
-                        os.remove(temp_output_path)
-                    continue
-
-                utils.log_error(
-                    config.ERROR_DIR,
-                    "sanitizer.py",
-                    "Compression failed; file moved to error folder.",
-                    processed_file_name=filename,
-                    complete_ai_response=stderr_text,
-                )
-
-                if os.path.exists(temp_output_path):
-                    os.remove(temp_output_path)
-                continue
-
-            try:
-                shutil.move(temp_output_path, target_path)
-            except OSError as exc:
-                utils.log_error(
-                    config.ERROR_DIR,
-                    "sanitizer.py",
-                    f"Compression succeeded but move to slides failed: {exc}",
-                    processed_file_name=filename,
-                )
-                if os.path.exists(temp_output_path):
-                    os.remove(temp_output_path)
-                continue
-
-            try:
-                os.remove(original_path)
-            except OSError as exc:
-                utils.log_error(
-                    config.ERROR_DIR,
-                    "sanitizer.py",
-                    f"Compressed file moved, but could not remove original: {exc}",
-                    processed_file_name=filename,
-                )
-
-            print("[sanitizer] Compression complete and file moved to slides.")
-            continue
-
-        try:
-            shutil.move(original_path, target_path)
-            print("[sanitizer] File moved to slides without compression.")
-        except OSError as exc:
-            utils.log_error(
-                config.ERROR_DIR,
-                "sanitizer.py",
-                f"Move to slides failed: {exc}",
-                processed_file_name=filename,
-            )
 
     print("[sanitizer] Sanitization step complete.")
 
@@ -1,12 +1,15 @@
 """Prompt management for AnkiAmour pipeline."""
 
+import functools
 import os
 from . import config
 
 
+@functools.lru_cache(maxsize=32)
 def get_prompt(prompt_name):
     """
-    Load a prompt file by name.
+    Load a prompt file by name. Results are memoized, so repeated
+    lookups of the same prompt read the file only once.
 
     Args:
         prompt_name: Filename (with or without .txt extension)
@@ -1,10 +1,48 @@
 """Shared utility functions for AnkiAmour pipeline."""
 
+import atexit
+import functools
 import json
 import os
+import random
 import re
+import shutil
+import threading
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# One append-mode handle per log path, held open for the process: each
+# log_error call costs a single write instead of an open/write/close
+# syscall trio. The lock keeps lines whole under the threaded movers
+# and backend workers.
+_LOG_LOCK = threading.Lock()
+_LOG_HANDLES = {}
+
+
+def _get_log_handle(error_dir, error_log):
+    """Return the cached append handle for error_log, opening it lazily."""
+    handle = _LOG_HANDLES.get(error_log)
+    if handle is None:
+        os.makedirs(error_dir, exist_ok=True)
+        handle = open(error_log, "ab")
+        _LOG_HANDLES[error_log] = handle
+    return handle
+
+
+@atexit.register
+def _close_log_handles():
+    """Flush and close any open error-log handles at interpreter exit."""
+    for handle in _LOG_HANDLES.values():
+        try:
+            handle.close()
+        except OSError:
+            pass
+    _LOG_HANDLES.clear()
+
 
 def log_error(
     error_dir,
@@ -16,7 +54,7 @@ def log_error(
     complete_ai_response="",
 ):
     """
-    Append a single error entry to error/errors.log in JSON format.
+    Append a single error entry to error/errors.log as one NDJSON line.
     """
     timestamp = datetime.now().isoformat(timespec="seconds")
 
@@ -30,25 +68,51 @@ def log_error(
         "Processed file name": processed_file_name,
     }
 
-    os.makedirs(error_dir, exist_ok=True)
     error_log = os.path.join(error_dir, "errors.log")
 
-    with open(error_log, "a", encoding="utf-8") as handle:
-        handle.write(json.dumps([entry], ensure_ascii=False) + "\n")
+    # NDJSON: one object per line. Readers json.loads each line; the old
+    # format wrapped every entry in a throwaway one-element list.
+    if orjson is not None:
+        # orjson emits UTF-8 bytes directly, matching ensure_ascii=False.
+        line = orjson.dumps(entry) + b"\n"
+    else:
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+    with _LOG_LOCK:
+        handle = _get_log_handle(error_dir, error_log)
+        handle.write(line)
+        # Flush so entries survive a crash despite the long-lived handle.
+        handle.flush()
 
 
 def strip_code_fences(text):
-    """Remove Markdown code fences (``` or ```json) if present."""
-    if "```" not in text:
+    """Remove Markdown code fences (``` or ```json) if present.
+
+    Uses explicit find() scans rather than a lazy DOTALL regex, which can
+    backtrack quadratically on multi-MB responses with stray backticks.
+    """
+    start = text.find("```")
+    if start == -1:
         return text
 
-    match = re.search(
-        r"```(?:json)?\s*(.*?)\s*```", text, re.DOTALL | re.IGNORECASE
-    )
-    if match:
-        return match.group(1).strip()
+    body_start = start + 3
+    if text[body_start : body_start + 4].lower() == "json":
+        body_start += 4
 
-    return text
+    end = text.find("```", body_start)
+    if end == -1:
+        return text
+
+    return text[body_start:end].strip()
+
+
+# First plausible JSON start; the regex engine skips the prose prefix in
+# C instead of a per-character Python loop.
+_JSON_START_RE = re.compile(r"[\[{]")
+
+# Shared decoder: raw_decode keeps no state between calls, so one
+# instance serves all threads instead of an allocation per extraction.
+_DECODER = json.JSONDecoder()
 
 
 def extract_json_payload(text):
@@ -57,43 +121,94 @@ def extract_json_payload(text):
 
     Handles Markdown fences, leading BOMs, and extra prose around JSON.
     """
-    cleaned = strip_code_fences(text).strip().lstrip("\ufeff")
-    if not cleaned:
+    cleaned = strip_code_fences(text)
+
+    # Skip leading whitespace/BOM with a cursor rather than strip()/lstrip()
+    # copies of the (potentially multi-MB) response.
+    idx = 0
+    length = len(cleaned)
+    while idx < length and cleaned[idx] in " \t\r\n\ufeff":
+        idx += 1
+    if idx == length:
         return ""
 
-    decoder = json.JSONDecoder()
-
-    # Scan for the first valid JSON object/array start and decode from there.
-    for index, ch in enumerate(cleaned):
-        if ch not in "[{":
-            continue
+    # Typical responses are pure JSON after fence stripping: one C-level
+    # validation pass returns the whole payload without entering the
+    # candidate scan at all.
+    if orjson is not None:
+        candidate = cleaned if idx == 0 else cleaned[idx:]
+        try:
+            orjson.loads(candidate)
+            return candidate
+        except orjson.JSONDecodeError:
+            pass
+
+    # Jump between candidate starts and decode in place: raw_decode takes
+    # a start index, so failed probes never slice-copy the tail.
+    match = _JSON_START_RE.search(cleaned, idx)
+    while match:
+        start = match.start()
         try:
-            _, end = decoder.raw_decode(cleaned[index:])
-            return cleaned[index : index + end]
+            _, end = _DECODER.raw_decode(cleaned, start)
+            return cleaned[start:end]
         except json.JSONDecodeError:
-            continue
+            match = _JSON_START_RE.search(cleaned, start + 1)
+
+    # No decodable payload: only now pay for the trimmed copy.
+    return cleaned.strip().lstrip("\ufeff")
+
 
-    return cleaned
+_RETRY_CODES = frozenset({429, 503})
+# Status codes are matched in the message; the rate_limit/server markers
+# follow vendor exception naming conventions and apply to the exception
+# type name only — messages routinely mention "server" in permanent
+# errors (e.g. "server does not support ...").
+_RETRY_STATUS_RE = re.compile(r"\b(?:429|503)\b")
+# rate_?limit covers both RateLimitError and rate_limit_error naming.
+_RETRY_NAME_RE = re.compile(r"rate_?limit|server", re.IGNORECASE)
 
 
 def is_retryable_error(exc):
     """Identify retryable errors based on common status codes and error types."""
-    error_type = type(exc).__name__
-    message = str(exc)
-    code = getattr(exc, "code", None)
-    status = getattr(exc, "status_code", None)
-
-    # Check for rate limit errors (429)
-    if "429" in message or "rate_limit" in error_type.lower():
+    if (
+        getattr(exc, "code", None) in _RETRY_CODES
+        or getattr(exc, "status_code", None) in _RETRY_CODES
+    ):
         return True
-    if code in (429, 503) or status in (429, 503):
+    if _RETRY_NAME_RE.search(type(exc).__name__):
         return True
+    return _RETRY_STATUS_RE.search(str(exc)) is not None
 
-    # Check for server errors (5xx)
-    if "503" in message or "server" in error_type.lower():
-        return True
 
-    return False
+@functools.lru_cache(maxsize=1)
+def has_qpdf():
+    """Check once whether the qpdf executable is on PATH."""
+    return shutil.which("qpdf") is not None
+
+
+def compute_backoff(attempt, base=1.0, cap=32.0, jitter=0.5):
+    """Exponential backoff delay in seconds with random jitter."""
+    return min(cap, base * 2**attempt) + random.random() * jitter
+
+
+def get_retry_after(exc):
+    """
+    Extract the server-suggested retry delay from an exception, if any.
+
+    Rate-limit responses from Anthropic/Gemini carry a Retry-After header;
+    honoring it avoids retrying before the server is ready.
+    """
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is None:
+        response = getattr(exc, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers is not None:
+            retry_after = headers.get("retry-after")
+
+    try:
+        return float(retry_after) if retry_after is not None else None
+    except (TypeError, ValueError):
+        return None
 
 
 def read_prompt(prompt_path):
@@ -102,30 +217,63 @@ def read_prompt(prompt_path):
         return handle.read()
 
 
+@functools.lru_cache(maxsize=None)
 def sanitize_tag(value):
-    """Replace spaces with underscores in tags."""
+    """Replace spaces with underscores in tags (memoized; bases recur on reruns)."""
     return value.replace(" ", "_")
 
 
 _BAD_CLOZE_PATTERN = re.compile(r"\{\{c(\d+):(?!:)")
+# Bound method: skips the pattern-attribute lookup per call in the
+# per-string normalization loops.
+_fix_cloze_sub = _BAD_CLOZE_PATTERN.sub
 
 
 def fix_cloze_format(text):
     """Normalize cloze deletions like {{c1:answer}} to {{c1::answer}}."""
-    return _BAD_CLOZE_PATTERN.sub(r"{{c\1::", text)
+    # C-level substring check; skips regex match setup for the common
+    # marker-free string.
+    if "{{c" not in text:
+        return text
+    return _fix_cloze_sub(r"{{c\1::", text)
 
 
 def normalize_cloze_payload(value):
-    """Walk lists/dicts and normalize cloze markers inside any strings."""
+    """Walk lists/dicts and normalize cloze markers inside any strings.
+
+    Containers are walked iteratively with an explicit stack and fixed
+    in place; strings without a "{{c" marker pass through untouched. The
+    common marker-free payload therefore costs one containment scan per
+    string and allocates no new containers, instead of a recursive deep
+    rebuild of the whole structure.
+    """
     if isinstance(value, str):
-        return fix_cloze_format(value)
-    if isinstance(value, list):
-        return [normalize_cloze_payload(item) for item in value]
-    if isinstance(value, dict):
-        return {key: normalize_cloze_payload(item) for key, item in value.items()}
+        return fix_cloze_format(value) if "{{c" in value else value
+    if not isinstance(value, (list, dict)):
+        return value
+
+    stack = [value]
+    while stack:
+        container = stack.pop()
+        items = (
+            enumerate(container) if isinstance(container, list) else container.items()
+        )
+        for key, item in items:
+            if isinstance(item, str):
+                if "{{c" in item:
+                    container[key] = fix_cloze_format(item)
+            elif isinstance(item, (list, dict)):
+                stack.append(item)
+
     return value
 
 
+# Fixed card schema, in output-column order; the validators test
+# membership per field instead of allocating a difference set per card.
+_REQUIRED_FIELDS = ("main_content", "extra_field", "importance_value")
+_AUTO_FILL_FIELDS = ("importance_value", "extra_field")
+
+
 def validate_required_fields(items, required_fields=None):
     """
     Ensure every card has required fields.
@@ -136,7 +284,7 @@ def validate_required_fields(items, required_fields=None):
     importance_value or extra_field, fill them with empty strings.
     """
     if required_fields is None:
-        required_fields = {"main_content", "extra_field", "importance_value"}
+        required_fields = _REQUIRED_FIELDS
 
     if not isinstance(items, list):
         return False, "AI response JSON is not a list.", None
@@ -153,11 +301,15 @@ def validate_required_fields(items, required_fields=None):
             print(f"[validation] {error_msg}")
             invalid_count += 1
             continue
-        
-        missing = required_fields.difference(item.keys())
+
+        # Tuple membership per field: no per-row set allocation, and the
+        # common all-fields-present card builds only an empty list.
+        missing = [field for field in required_fields if field not in item]
         if missing:
             # Check if card has main_content and only missing importance_value or extra_field
-            if "main_content" in item.keys() and missing.issubset({"importance_value", "extra_field"}):
+            if "main_content" in item and all(
+                field in _AUTO_FILL_FIELDS for field in missing
+            ):
                 # Fill missing fields with empty strings
                 for field in missing:
                     item[field] = ""
@@ -195,37 +347,134 @@ def validate_required_fields(items, required_fields=None):
     return True, "", items
 
 
+def fused_validate_normalize_tag(cards, tag, required_fields=None):
+    """
+    Validate, cloze-normalize, and tag cards in a single pass.
+
+    Same semantics as validate_required_fields + normalize_cloze_payload +
+    tagging, but one iteration over the list instead of three.
+    Returns (valid_cards, error_message); valid_cards is None on failure,
+    and error_message carries auto-correction info as JSON when relevant.
+    """
+    if required_fields is None:
+        required_fields = _REQUIRED_FIELDS
+
+    if not isinstance(cards, list):
+        return None, "AI response JSON is not a list."
+
+    valid_cards = []
+    invalid_count = 0
+    corrected_cards = []
+
+    for index, item in enumerate(cards, start=1):
+        if not isinstance(item, dict):
+            item_type = type(item).__name__
+            item_preview = str(item)[:100] if item else "None/empty"
+            print(f"[validation] Card #{index} skipped: not an object (type: {item_type}, value: {item_preview})")
+            invalid_count += 1
+            continue
+
+        missing = [field for field in required_fields if field not in item]
+        if missing:
+            if "main_content" in item and all(
+                field in _AUTO_FILL_FIELDS for field in missing
+            ):
+                for field in missing:
+                    item[field] = ""
+                corrected_cards.append({
+                    "card_index": index,
+                    "missing_fields": sorted(missing),
+                })
+                print(f"[validation] Card #{index} auto-corrected: filled missing fields {sorted(missing)} with empty strings")
+            else:
+                print(f"[validation] Card #{index} skipped: missing fields {sorted(missing)}")
+                invalid_count += 1
+                continue
+
+        item = normalize_cloze_payload(item)
+
+        existing_value = item.get("importance_value")
+        item["importance_value"] = f"{existing_value} {tag}" if existing_value else tag
+
+        valid_cards.append(item)
+
+    if not valid_cards:
+        return None, f"No valid cards found. {invalid_count} cards were invalid."
+
+    if invalid_count > 0 or corrected_cards:
+        summary = f"Recovered {len(valid_cards)} valid cards"
+        if corrected_cards:
+            summary += f" ({len(corrected_cards)} auto-corrected"
+            summary += f", {invalid_count} skipped)" if invalid_count > 0 else ")"
+        else:
+            summary += f" (skipped {invalid_count} invalid ones)"
+        print(f"[validation] {summary}")
+        return valid_cards, json.dumps({"corrected_cards": corrected_cards})
+
+    return valid_cards, ""
+
+
+def _list_by_ext(directory, ext):
+    """Sorted names of files in directory with the given extension.
+
+    One scandir pass: is_file() reuses the type info readdir already
+    returned, so no per-entry stat, and only the suffix is lowercased
+    for the comparison.
+    """
+    suffix_len = len(ext)
+    with os.scandir(directory) as entries:
+        names = [
+            entry.name
+            for entry in entries
+            if entry.name[-suffix_len:].lower() == ext
+            and entry.is_file(follow_symlinks=False)
+        ]
+    names.sort(key=str.lower)
+    return names
+
+
 def get_pdf_files(directory):
     """Get sorted list of PDF files in directory."""
-    pdf_files = [
-        name
-        for name in os.listdir(directory)
-        if name.lower().endswith(".pdf") and os.path.isfile(os.path.join(directory, name))
-    ]
-    pdf_files.sort(key=str.lower)
-    return pdf_files
+    return _list_by_ext(directory, ".pdf")
+
+
+def get_pdf_entries(directory):
+    """Get (name, size) tuples for PDF files in directory, sorted by name.
+
+    The size comes from the scandir entry's cached stat, so callers that
+    branch on file size skip a getsize syscall per file.
+    """
+    with os.scandir(directory) as entries:
+        pdf_entries = [
+            (entry.name, entry.stat().st_size)
+            for entry in entries
+            if entry.name[-4:].lower() == ".pdf"
+            and entry.is_file(follow_symlinks=False)
+        ]
+    pdf_entries.sort(key=lambda item: item[0].lower())
+    return pdf_entries
 
 
 def get_json_files(directory):
     """Get sorted list of JSON files in directory."""
-    json_files = [
-        name
-        for name in os.listdir(directory)
-        if name.lower().endswith(".json")
-        and os.path.isfile(os.path.join(directory, name))
-    ]
-    json_files.sort(key=str.lower)
-    return json_files
+    return _list_by_ext(directory, ".json")
 
 
 def get_csv_files(directory, exclude_pattern=None):
-    """Get sorted list of CSV files in directory."""
-    csv_files = [
-        name
-        for name in os.listdir(directory)
-        if name.lower().endswith(".csv")
-        and os.path.isfile(os.path.join(directory, name))
-        and (exclude_pattern is None or not exclude_pattern(name))
-    ]
-    csv_files.sort(key=str.lower)
+    """Get (name, mtime) tuples for CSV files in directory, sorted by name.
+
+    One scandir pass gathers names and mtimes together — entry.stat()
+    reuses the directory-walk file handle instead of a fresh path lookup
+    per file — so callers sorting or filtering by mtime need no second
+    stat pass. Callers index [0] for the name and [1] for the mtime.
+    """
+    with os.scandir(directory) as entries:
+        csv_files = [
+            (entry.name, entry.stat().st_mtime)
+            for entry in entries
+            if entry.name[-4:].lower() == ".csv"
+            and entry.is_file(follow_symlinks=False)
+            and (exclude_pattern is None or not exclude_pattern(entry.name))
+        ]
+    csv_files.sort(key=lambda item: item[0].lower())
     return csv_files